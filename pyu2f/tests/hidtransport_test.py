@@ -14,7 +14,6 @@
 
 """Tests for pyu2f.hidtransport."""
 
-from six.moves import range
 import sys
 
 import mock
@@ -28,6 +27,12 @@ if sys.version_info[:2] < (2, 7):
 else:
   import unittest  # pylint: disable=g-import-not-at-top
 
+_CID = b'\x00\x00\x00\x01'
+_STATUS_9000 = b'\x01\x90\x00'
+
+# 1000 byte payload cycling through 0x00-0xff, used for fragmentation tests.
+_PATTERN_1000 = bytes(bytearray(range(256)) * 3 + bytearray(range(232)))
+
 
 def MakeKeyboard(path, usage):
   d = {}
@@ -50,8 +55,9 @@ def MakeU2F(path):
 
 
 def RPad(collection, to_size):
-  while len(collection) < to_size:
-    collection.append(0)
+  pad = to_size - len(collection)
+  if pad > 0:
+    collection.extend([0] * pad)
   return collection
 
 
@@ -100,29 +106,27 @@ class DiscoveryTest(unittest.TestCase):
 class TransportTest(unittest.TestCase):
 
   def testInit(self):
-    fake_hid_dev = util.FakeHidDevice(bytearray([0x00, 0x00, 0x00, 0x01]))
+    fake_hid_dev = util.FakeHidDevice(_CID)
     t = hidtransport.UsbHidTransport(fake_hid_dev)
-    self.assertEqual(t.cid, bytearray([0x00, 0x00, 0x00, 0x01]))
+    self.assertEqual(t.cid, _CID)
     self.assertEqual(t.u2fhid_version, 0x01)
 
   def testPing(self):
-    fake_hid_dev = util.FakeHidDevice(bytearray([0x00, 0x00, 0x00, 0x01]))
+    fake_hid_dev = util.FakeHidDevice(_CID)
     t = hidtransport.UsbHidTransport(fake_hid_dev)
 
     reply = t.SendPing(b'1234')
     self.assertEqual(reply, b'1234')
 
   def testMsg(self):
-    fake_hid_dev = util.FakeHidDevice(
-        bytearray([0x00, 0x00, 0x00, 0x01]), bytearray([0x01, 0x90, 0x00]))
+    fake_hid_dev = util.FakeHidDevice(_CID, _STATUS_9000)
     t = hidtransport.UsbHidTransport(fake_hid_dev)
 
     reply = t.SendMsgBytes([0x00, 0x01, 0x00, 0x00])
-    self.assertEqual(reply, bytearray([0x01, 0x90, 0x00]))
+    self.assertEqual(reply, _STATUS_9000)
 
   def testMsgBusy(self):
-    fake_hid_dev = util.FakeHidDevice(
-        bytearray([0x00, 0x00, 0x00, 0x01]), bytearray([0x01, 0x90, 0x00]))
+    fake_hid_dev = util.FakeHidDevice(_CID, _STATUS_9000)
     t = hidtransport.UsbHidTransport(fake_hid_dev)
 
     # Each call will retry twice: the first attempt will fail after 2 retreis,
@@ -133,21 +137,20 @@ class TransportTest(unittest.TestCase):
                              [0x00, 0x01, 0x00, 0x00])
 
       reply = t.SendMsgBytes([0x00, 0x01, 0x00, 0x00])
-      self.assertEqual(reply, bytearray([0x01, 0x90, 0x00]))
+      self.assertEqual(reply, _STATUS_9000)
 
   def testFragmentedResponseMsg(self):
-    body = bytearray([x % 256 for x in range(0, 1000)])
-    fake_hid_dev = util.FakeHidDevice(bytearray([0x00, 0x00, 0x00, 0x01]), body)
+    body = bytearray(_PATTERN_1000)
+    fake_hid_dev = util.FakeHidDevice(_CID, body)
     t = hidtransport.UsbHidTransport(fake_hid_dev)
 
     reply = t.SendMsgBytes([0x00, 0x01, 0x00, 0x00])
     # Confirm we properly reassemble the message
-    self.assertEqual(reply, bytearray(x % 256 for x in range(0, 1000)))
+    self.assertEqual(reply, _PATTERN_1000)
 
   def testFragmentedSendApdu(self):
-    body = bytearray(x % 256 for x in range(0, 1000))
-    fake_hid_dev = util.FakeHidDevice(
-        bytearray([0x00, 0x00, 0x00, 0x01]), [0x90, 0x00])
+    body = bytearray(_PATTERN_1000)
+    fake_hid_dev = util.FakeHidDevice(_CID, [0x90, 0x00])
     t = hidtransport.UsbHidTransport(fake_hid_dev)
 
     reply = t.SendMsgBytes(body)
@@ -30,10 +30,23 @@ else:
 
 class U2fTest(unittest.TestCase):
 
-  def testRegisterSuccessWithTUP(self):
+  _VERSION_V2 = b'U2F_V2'
+  # Registered keys are only read by U2FInterface, so they can be shared.
+  _KEY_A = model.RegisteredKey('khA')
+  _KEY_B = model.RegisteredKey('khB')
+
+  def MakeSecurityKey(self, register_side_effect=None,
+                      authenticate_side_effect=None):
+    """Returns a mock security key that reports version U2F_V2."""
     mock_sk = mock.MagicMock()
-    mock_sk.CmdRegister.side_effect = [errors.TUPRequiredError, 'regdata']
-    mock_sk.CmdVersion.return_value = b'U2F_V2'
+    mock_sk.CmdRegister.side_effect = register_side_effect
+    mock_sk.CmdAuthenticate.side_effect = authenticate_side_effect
+    mock_sk.CmdVersion.return_value = self._VERSION_V2
+    return mock_sk
+
+  def testRegisterSuccessWithTUP(self):
+    mock_sk = self.MakeSecurityKey(
+        register_side_effect=[errors.TUPRequiredError, 'regdata'])
 
     u2f_api = u2f.U2FInterface(mock_sk)
 
@@ -45,14 +58,13 @@ class U2fTest(unittest.TestCase):
     self.assertEqual(resp.registration_data, 'regdata')
 
   def testRegisterSuccessWithPreviousKeys(self):
-    mock_sk = mock.MagicMock()
-    mock_sk.CmdAuthenticate.side_effect = errors.InvalidKeyHandleError
-    mock_sk.CmdRegister.side_effect = [errors.TUPRequiredError, 'regdata']
-    mock_sk.CmdVersion.return_value = b'U2F_V2'
+    mock_sk = self.MakeSecurityKey(
+        register_side_effect=[errors.TUPRequiredError, 'regdata'],
+        authenticate_side_effect=errors.InvalidKeyHandleError)
 
     u2f_api = u2f.U2FInterface(mock_sk)
 
-    resp = u2f_api.Register('testapp', b'ABCD', [model.RegisteredKey('khA')])
+    resp = u2f_api.Register('testapp', b'ABCD', [self._KEY_A])
     self.assertEqual(mock_sk.CmdAuthenticate.call_count, 1)
     # Should be "Check only"
     self.assertTrue(mock_sk.CmdAuthenticate.call_args[0][3])
@@ -64,14 +76,13 @@ class U2fTest(unittest.TestCase):
     self.assertEqual(resp.registration_data, 'regdata')
 
   def testRegisterFailAlreadyRegistered(self):
-    mock_sk = mock.MagicMock()
-    mock_sk.CmdAuthenticate.side_effect = errors.TUPRequiredError
-    mock_sk.CmdVersion.return_value = b'U2F_V2'
+    mock_sk = self.MakeSecurityKey(
+        authenticate_side_effect=errors.TUPRequiredError)
 
     u2f_api = u2f.U2FInterface(mock_sk)
 
     with self.assertRaises(errors.U2FError) as cm:
-      u2f_api.Register('testapp', b'ABCD', [model.RegisteredKey('khA')])
+      u2f_api.Register('testapp', b'ABCD', [self._KEY_A])
     self.assertEqual(cm.exception.code, errors.U2FError.DEVICE_INELIGIBLE)
 
     self.assertEqual(mock_sk.CmdAuthenticate.call_count, 1)
@@ -81,24 +92,33 @@ class U2fTest(unittest.TestCase):
     self.assertEqual(mock_sk.CmdRegister.call_count, 0)
     self.assertEqual(mock_sk.CmdWink.call_count, 0)
 
-  def testRegisterTimeout(self):
-    mock_sk = mock.MagicMock()
-    mock_sk.CmdRegister.side_effect = errors.TUPRequiredError
-    mock_sk.CmdVersion.return_value = b'U2F_V2'
-    u2f_api = u2f.U2FInterface(mock_sk)
-
-    # Speed up the test by mocking out sleep to do nothing
-    with mock.patch.object(u2f, 'time') as _:
-      with self.assertRaises(errors.U2FError) as cm:
-        u2f_api.Register('testapp', b'ABCD', [])
-    self.assertEqual(cm.exception.code, errors.U2FError.TIMEOUT)
-    self.assertEqual(mock_sk.CmdRegister.call_count, 30)
-    self.assertEqual(mock_sk.CmdWink.call_count, 30)
+  def testTimeout(self):
+    cases = [
+        ('Register', 'CmdRegister',
+         {'register_side_effect': errors.TUPRequiredError},
+         lambda u2f_api: u2f_api.Register('testapp', b'ABCD', [])),
+        ('Authenticate', 'CmdAuthenticate',
+         {'authenticate_side_effect': errors.TUPRequiredError},
+         lambda u2f_api: u2f_api.Authenticate('testapp', b'ABCD',
+                                              [self._KEY_A])),
+    ]
+
+    # Speed up the test by replacing sleep with a plain no-op function
+    with mock.patch.object(u2f.time, 'sleep', lambda _: None):
+      for name, cmd, side_effects, request in cases:
+        with self.subTest(name):
+          mock_sk = self.MakeSecurityKey(**side_effects)
+          u2f_api = u2f.U2FInterface(mock_sk)
+
+          with self.assertRaises(errors.U2FError) as cm:
+            request(u2f_api)
+          self.assertEqual(cm.exception.code, errors.U2FError.TIMEOUT)
+          self.assertEqual(getattr(mock_sk, cmd).call_count, 30)
+          self.assertEqual(mock_sk.CmdWink.call_count, 30)
 
   def testRegisterError(self):
-    mock_sk = mock.MagicMock()
-    mock_sk.CmdRegister.side_effect = errors.ApduError(0xff, 0xff)
-    mock_sk.CmdVersion.return_value = b'U2F_V2'
+    mock_sk = self.MakeSecurityKey(
+        register_side_effect=errors.ApduError(0xff, 0xff))
     u2f_api = u2f.U2FInterface(mock_sk)
 
     with self.assertRaises(errors.U2FError) as cm:
@@ -111,14 +131,12 @@ class U2fTest(unittest.TestCase):
     self.assertEqual(mock_sk.CmdWink.call_count, 0)
 
   def testAuthenticateSuccessWithTUP(self):
-    mock_sk = mock.MagicMock()
-    mock_sk.CmdAuthenticate.side_effect = [errors.TUPRequiredError, 'signature']
-    mock_sk.CmdVersion.return_value = b'U2F_V2'
+    mock_sk = self.MakeSecurityKey(
+        authenticate_side_effect=[errors.TUPRequiredError, 'signature'])
 
     u2f_api = u2f.U2FInterface(mock_sk)
 
-    resp = u2f_api.Authenticate('testapp', b'ABCD',
-                                [model.RegisteredKey('khA')])
+    resp = u2f_api.Authenticate('testapp', b'ABCD', [self._KEY_A])
     self.assertEqual(mock_sk.CmdAuthenticate.call_count, 2)
     self.assertEqual(mock_sk.CmdWink.call_count, 1)
     self.assertEqual(resp.key_handle, 'khA')
@@ -127,16 +145,12 @@ class U2fTest(unittest.TestCase):
     self.assertEqual(resp.signature_data, 'signature')
 
   def testAuthenticateSuccessSkipInvalidKey(self):
-    mock_sk = mock.MagicMock()
-    mock_sk.CmdAuthenticate.side_effect = [errors.InvalidKeyHandleError,
-                                           'signature']
-    mock_sk.CmdVersion.return_value = b'U2F_V2'
+    mock_sk = self.MakeSecurityKey(
+        authenticate_side_effect=[errors.InvalidKeyHandleError, 'signature'])
 
     u2f_api = u2f.U2FInterface(mock_sk)
 
-    resp = u2f_api.Authenticate(
-        'testapp', b'ABCD',
-        [model.RegisteredKey('khA'), model.RegisteredKey('khB')])
+    resp = u2f_api.Authenticate('testapp', b'ABCD', [self._KEY_A, self._KEY_B])
     self.assertEqual(mock_sk.CmdAuthenticate.call_count, 2)
     self.assertEqual(mock_sk.CmdWink.call_count, 0)
     self.assertEqual(resp.key_handle, 'khB')
@@ -145,9 +159,8 @@ class U2fTest(unittest.TestCase):
     self.assertEqual(resp.signature_data, 'signature')
 
   def testAuthenticateSuccessSkipInvalidVersion(self):
-    mock_sk = mock.MagicMock()
+    mock_sk = self.MakeSecurityKey()
     mock_sk.CmdAuthenticate.return_value = 'signature'
-    mock_sk.CmdVersion.return_value = b'U2F_V2'
 
     u2f_api = u2f.U2FInterface(mock_sk)
 
@@ -155,7 +168,7 @@ class U2fTest(unittest.TestCase):
                                 b'ABCD',
                                 [model.RegisteredKey('khA',
                                                      version='U2F_V3'),
-                                 model.RegisteredKey('khB')])
+                                 self._KEY_B])
     self.assertEqual(mock_sk.CmdAuthenticate.call_count, 1)
     self.assertEqual(mock_sk.CmdWink.call_count, 0)
     self.assertEqual(resp.key_handle, 'khB')
@@ -163,42 +176,24 @@ class U2fTest(unittest.TestCase):
     self.assertEqual(resp.client_data.typ, 'navigator.id.getAssertion')
     self.assertEqual(resp.signature_data, 'signature')
 
-  def testAuthenticateTimeout(self):
-    mock_sk = mock.MagicMock()
-    mock_sk.CmdAuthenticate.side_effect = errors.TUPRequiredError
-    mock_sk.CmdVersion.return_value = b'U2F_V2'
-    u2f_api = u2f.U2FInterface(mock_sk)
-
-    # Speed up the test by mocking out sleep to do nothing
-    with mock.patch.object(u2f, 'time') as _:
-      with self.assertRaises(errors.U2FError) as cm:
-        u2f_api.Authenticate('testapp', b'ABCD', [model.RegisteredKey('khA')])
-    self.assertEqual(cm.exception.code, errors.U2FError.TIMEOUT)
-    self.assertEqual(mock_sk.CmdAuthenticate.call_count, 30)
-    self.assertEqual(mock_sk.CmdWink.call_count, 30)
-
   def testAuthenticateAllKeysInvalid(self):
-    mock_sk = mock.MagicMock()
-    mock_sk.CmdAuthenticate.side_effect = errors.InvalidKeyHandleError
-    mock_sk.CmdVersion.return_value = b'U2F_V2'
+    mock_sk = self.MakeSecurityKey(
+        authenticate_side_effect=errors.InvalidKeyHandleError)
 
     u2f_api = u2f.U2FInterface(mock_sk)
     with self.assertRaises(errors.U2FError) as cm:
-      u2f_api.Authenticate('testapp', b'ABCD',
-                           [model.RegisteredKey('khA'),
-                            model.RegisteredKey('khB')])
+      u2f_api.Authenticate('testapp', b'ABCD', [self._KEY_A, self._KEY_B])
     self.assertEqual(cm.exception.code, errors.U2FError.DEVICE_INELIGIBLE)
 
     u2f_api = u2f.U2FInterface(mock_sk)
 
   def testAuthenticateError(self):
-    mock_sk = mock.MagicMock()
-    mock_sk.CmdAuthenticate.side_effect = errors.ApduError(0xff, 0xff)
-    mock_sk.CmdVersion.return_value = b'U2F_V2'
+    mock_sk = self.MakeSecurityKey(
+        authenticate_side_effect=errors.ApduError(0xff, 0xff))
     u2f_api = u2f.U2FInterface(mock_sk)
 
     with self.assertRaises(errors.U2FError) as cm:
-      u2f_api.Authenticate('testapp', b'ABCD', [model.RegisteredKey('khA')])
+      u2f_api.Authenticate('testapp', b'ABCD', [self._KEY_A])
     self.assertEqual(cm.exception.code, errors.U2FError.BAD_REQUEST)
     self.assertEqual(cm.exception.cause.sw1, 0xff)
     self.assertEqual(cm.exception.cause.sw2, 0xff)
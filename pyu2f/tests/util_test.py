@@ -14,7 +14,6 @@
 
 """Tests for pyu2f.tests.lib.util."""
 
-from six.moves import range
 import sys
 
 from pyu2f.tests.lib import util
@@ -30,35 +29,27 @@ class UtilTest(unittest.TestCase):
   def testSimplePing(self):
     dev = util.FakeHidDevice(cid_to_allocate=None)
     dev.Write([0, 0, 0, 1, 0x81, 0, 3, 1, 2, 3])
-    self.assertEqual(
-        dev.Read(), [0, 0, 0, 1, 0x81, 0, 3, 1, 2, 3] + [0
-                                                         for _ in range(54)])
+    self.assertEqual(dev.Read(), [0, 0, 0, 1, 0x81, 0, 3, 1, 2, 3] + [0] * 54)
 
   def testErrorBusy(self):
     dev = util.FakeHidDevice(cid_to_allocate=None)
     dev.SetChannelBusyCount(2)
     dev.Write([0, 0, 0, 1, 0x81, 0, 3, 1, 2, 3])
-    self.assertEqual(
-        dev.Read(), [0, 0, 0, 1, 0xbf, 0, 1, 6] + [0 for _ in range(56)])
+    self.assertEqual(dev.Read(), [0, 0, 0, 1, 0xbf, 0, 1, 6] + [0] * 56)
     dev.Write([0, 0, 0, 1, 0x81, 0, 3, 1, 2, 3])
-    self.assertEqual(
-        dev.Read(), [0, 0, 0, 1, 0xbf, 0, 1, 6] + [0 for _ in range(56)])
+    self.assertEqual(dev.Read(), [0, 0, 0, 1, 0xbf, 0, 1, 6] + [0] * 56)
     dev.Write([0, 0, 0, 1, 0x81, 0, 3, 1, 2, 3])
-    self.assertEqual(
-        dev.Read(), [0, 0, 0, 1, 0x81, 0, 3, 1, 2, 3] + [0
-                                                         for _ in range(54)])
+    self.assertEqual(dev.Read(), [0, 0, 0, 1, 0x81, 0, 3, 1, 2, 3] + [0] * 54)
 
   def testFragmentedApdu(self):
     dev = util.FakeHidDevice(cid_to_allocate=None,
                              msg_reply=list(range(85, 0, -1)))
-    dev.Write([0, 0, 0, 1, 0x83, 0, 100] + [x for x in range(57)])
-    dev.Write([0, 0, 0, 1, 0] + [x for x in range(57, 100)])
+    dev.Write([0, 0, 0, 1, 0x83, 0, 100] + list(range(57)))
+    dev.Write([0, 0, 0, 1, 0] + list(range(57, 100)))
     self.assertEqual(
-        dev.Read(), [0, 0, 0, 1, 0x83, 0, 85] + [x for x in range(85, 28, -1)])
+        dev.Read(), [0, 0, 0, 1, 0x83, 0, 85] + list(range(85, 28, -1)))
     self.assertEqual(
-        dev.Read(),
-        [0, 0, 0, 1, 0] + [x for x in range(28, 0, -1)] + [0
-                                                           for _ in range(31)])
+        dev.Read(), [0, 0, 0, 1, 0] + list(range(28, 0, -1)) + [0] * 31)
 
 
 if __name__ == '__main__':